@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tool execution endpoint - This will be accessible at /api/execute
+Accepts a single {"tool", "arguments"} call, or a {"ops": [...]} batch so
+clients can run several independent operations in one round trip.
+"""
+
+import gzip
+import json
+from http.server import BaseHTTPRequestHandler
+
+try:
+    from api.sse import execute_tool
+except ImportError:
+    # Local development runs with api/ itself on the path
+    from sse import execute_tool
+
+
+class handler(BaseHTTPRequestHandler):
+    """Vercel handler for the execute endpoint"""
+
+    def do_OPTIONS(self):
+        """Handle CORS preflight"""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Accept, Authorization')
+        self.end_headers()
+
+    def do_POST(self):
+        """Execute one tool call or an ordered batch of them"""
+        content_length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(content_length) if content_length > 0 else b''
+
+        try:
+            # Clients may gzip large script/dataset uploads
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            message = json.loads(body) if body else {}
+        except Exception as e:
+            self._send_json(400, {"success": False, "error": f"Invalid JSON: {str(e)}"})
+            return
+
+        # Valid JSON is not necessarily a valid request: reject unexpected
+        # shapes with a 400 instead of letting an AttributeError drop the
+        # connection.
+        if not isinstance(message, dict):
+            self._send_json(400, {"success": False, "error": "Request body must be a JSON object"})
+            return
+
+        try:
+            if "ops" in message:
+                ops = message["ops"]
+                if not isinstance(ops, list) or not all(isinstance(op, dict) for op in ops):
+                    self._send_json(400, {"success": False, "error": '"ops" must be a list of objects'})
+                    return
+                # Batch: run each op in order and return the results in
+                # order, amortizing the request round trip across all of
+                # them.
+                results = [
+                    execute_tool(op.get("tool"), op.get("arguments", {}))
+                    for op in ops
+                ]
+                self._send_json(200, {"success": True, "results": results})
+            else:
+                result = execute_tool(message.get("tool"), message.get("arguments", {}))
+                self._send_json(200, result)
+        except Exception as e:
+            self._send_json(400, {"success": False, "error": str(e)})
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload, separators=(",", ":")).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
@@ -4,25 +4,218 @@ SSE Endpoint for MCP - Vercel Serverless Function
 This file creates the /api/sse endpoint automatically
 """
 
+import functools
 import json
-import subprocess
+import mmap
+import os
 import sys
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from http.server import BaseHTTPRequestHandler
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compact separators: the default ", "/": " padding is pure wasted bytes on
+# every SSE frame (orjson already emits compact JSON).
+_J = functools.partial(json.dumps, separators=(",", ":"))
+
+if orjson is not None:
+    def _dumps(obj) -> bytes:
+        """Serialize to JSON bytes (C-speed via orjson)"""
+        return orjson.dumps(obj)
+else:
+    def _dumps(obj) -> bytes:
+        """Serialize to JSON bytes (stdlib fallback)"""
+        return _J(obj).encode('utf-8')
+
 # Workspace directory
 WORKSPACE_DIR = Path("/tmp/workspace")
 WORKSPACE_DIR.mkdir(exist_ok=True)
 
 
+def _worker_main(conn, workspace: str):
+    """Loop forever in the child process, running scripts sent over the pipe"""
+    import contextlib
+    import io
+    import os
+    import runpy
+    import traceback
+
+    class _LineStream(io.TextIOBase):
+        """Accumulates output while streaming completed lines to the parent"""
+
+        def __init__(self):
+            self._parts = []
+            self._linebuf = ""
+
+        def writable(self):
+            return True
+
+        def write(self, s):
+            self._parts.append(s)
+            self._linebuf += s
+            while "\n" in self._linebuf:
+                line, self._linebuf = self._linebuf.split("\n", 1)
+                try:
+                    conn.send(("line", line))
+                except (BrokenPipeError, OSError):
+                    pass
+            return len(s)
+
+        def getvalue(self):
+            return "".join(self._parts)
+
+    while True:
+        try:
+            path, args = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        # Re-pin the working directory on every run: a script that calls
+        # os.chdir() must not redirect the next script's relative paths
+        # outside the workspace.
+        os.chdir(workspace)
+
+        stdout, stderr = _LineStream(), io.StringIO()
+        exit_code = 0
+        saved_argv = sys.argv
+        preloaded = set(sys.modules)
+        try:
+            sys.argv = [path] + list(args)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                runpy.run_path(path, run_name="__main__")
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                exit_code = e.code
+            elif e.code is not None:
+                stderr.write(f"{e.code}\n")
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc(file=stderr)
+            exit_code = 1
+        finally:
+            sys.argv = saved_argv
+            # Drop modules the script imported so its state (and memory)
+            # does not leak into later runs. In-place mutations of modules
+            # already loaded here (e.g. monkeypatching json.loads) still
+            # persist until the worker is respawned.
+            for name in set(sys.modules) - preloaded:
+                del sys.modules[name]
+
+        try:
+            conn.send(("done", (stdout.getvalue(), stderr.getvalue(), exit_code)))
+        except (BrokenPipeError, OSError):
+            break
+
+
+class _PythonWorker:
+    """Long-lived child process for execute_python.
+
+    Forking once and reusing the child amortizes interpreter startup
+    (~100-300 ms per subprocess.run) across calls. A hung script gets the
+    worker killed and respawned so the next call starts clean.
+    """
+
+    def __init__(self):
+        import multiprocessing
+
+        self._ctx = multiprocessing.get_context("fork")
+        # One script at a time: concurrent handler threads must not
+        # interleave their messages on the single worker pipe.
+        self._lock = threading.Lock()
+        self._spawn()
+
+    def _spawn(self):
+        self._conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, str(WORKSPACE_DIR)),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+    def run(self, filepath: str, args: list, timeout: float, on_line=None) -> tuple:
+        """Run a script in the worker, returning (stdout, stderr, exit_code).
+
+        Calls on_line with each completed stdout line as the script produces
+        it, so callers can stream output instead of waiting for completion.
+        """
+        with self._lock:
+            if not self._process.is_alive():
+                self._spawn()
+            self._conn.send((filepath, args))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._conn.poll(remaining):
+                    self._process.kill()
+                    self._process.join()
+                    self._spawn()
+                    raise TimeoutError(f"Script execution timed out after {timeout:.0f} seconds")
+                kind, payload = self._conn.recv()
+                if kind == "line":
+                    if on_line is not None:
+                        on_line(payload)
+                else:
+                    return payload
+
+
+# Spawned lazily: most invocations never touch execute_python, and forking
+# (plus importing multiprocessing) at import time would tax every cold start.
+_WORKER = None
+_WORKER_FAILED = False
+_WORKER_LOCK = threading.Lock()
+
+
+def _get_worker():
+    """Return the persistent worker, spawning it on first use"""
+    global _WORKER, _WORKER_FAILED
+    if _WORKER is None and not _WORKER_FAILED:
+        with _WORKER_LOCK:
+            if _WORKER is None and not _WORKER_FAILED:
+                try:
+                    _WORKER = _PythonWorker()
+                except (ValueError, OSError):
+                    # "fork" start method unavailable (e.g. non-POSIX);
+                    # fall back to subprocess
+                    _WORKER_FAILED = True
+    return _WORKER
+
+
+# Resolved once: the workspace root never moves, so don't re-run the
+# realpath walk on every tool call.
+_WS_RESOLVED = WORKSPACE_DIR.resolve()
+
+
+@functools.lru_cache(maxsize=512)
 def get_safe_path(filepath: str) -> Path:
     """Ensure path is within workspace directory"""
-    requested_path = WORKSPACE_DIR / filepath
-    resolved_path = requested_path.resolve()
-    
-    if not str(resolved_path).startswith(str(WORKSPACE_DIR.resolve())):
+    # Cheap rejects first: refusing the obvious traversal attempts takes a
+    # few string scans and no syscalls.
+    if "\x00" in filepath:
+        raise ValueError("Path must not contain NUL bytes")
+    if filepath.startswith(("/", "\\")):
+        raise ValueError("Path must be relative to the workspace")
+    if ".." in filepath.replace("\\", "/").split("/"):
         raise ValueError("Path must be within workspace directory")
-    
+
+    # Accepted paths still get the full resolve() containment check:
+    # scripts run via execute_python can create symlinks inside the
+    # workspace, so the string scan alone is not proof of containment.
+    resolved_path = (WORKSPACE_DIR / filepath).resolve()
+
+    # Component-wise containment check: pure in-memory comparison, and
+    # unlike a string prefix test it cannot be fooled by a sibling like
+    # /tmp/workspace2.
+    if not resolved_path.is_relative_to(_WS_RESOLVED):
+        raise ValueError("Path must be within workspace directory")
+
     return resolved_path
 
 
@@ -111,91 +304,264 @@ def get_tools() -> list[dict]:
     ]
 
 
-def execute_tool(name: str, arguments: dict) -> dict:
-    """Execute a tool and return the result"""
+# Below this size the extra mmap/munmap syscalls cost more than the copy
+# they save.
+_MMAP_READ_THRESHOLD = 64 * 1024
+
+
+def _read_bytes(filepath: Path) -> bytes:
+    """Read a whole file through a raw fd, skipping the buffered io layer"""
+    fd = os.open(str(filepath), os.O_RDONLY)
     try:
-        if name == "create_file":
-            filepath = get_safe_path(arguments["filepath"])
-            content = arguments["content"]
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            filepath.write_text(content, encoding="utf-8")
-            return {"success": True, "message": f"Created file: {arguments['filepath']} ({len(content)} bytes)"}
-        
-        elif name == "read_file":
-            filepath = get_safe_path(arguments["filepath"])
-            if not filepath.exists():
-                return {"success": False, "error": f"File not found: {arguments['filepath']}"}
-            content = filepath.read_text(encoding="utf-8")
-            return {"success": True, "content": content, "filepath": arguments['filepath']}
-        
-        elif name == "update_file":
-            filepath = get_safe_path(arguments["filepath"])
-            content = arguments["content"]
-            if not filepath.exists():
-                return {"success": False, "error": f"File not found: {arguments['filepath']}"}
-            filepath.write_text(content, encoding="utf-8")
-            return {"success": True, "message": f"Updated file: {arguments['filepath']} ({len(content)} bytes)"}
-        
-        elif name == "delete_file":
-            filepath = get_safe_path(arguments["filepath"])
-            if not filepath.exists():
-                return {"success": False, "error": f"File not found: {arguments['filepath']}"}
-            filepath.unlink()
-            return {"success": True, "message": f"Deleted file: {arguments['filepath']}"}
-        
-        elif name == "list_files":
-            directory = arguments.get("directory", "")
-            dirpath = get_safe_path(directory) if directory else WORKSPACE_DIR
-            if not dirpath.exists():
-                return {"success": False, "error": f"Directory not found: {directory}"}
-            
-            files = []
-            dirs = []
-            for item in sorted(dirpath.iterdir()):
-                rel_path = str(item.relative_to(WORKSPACE_DIR))
-                if item.is_file():
-                    files.append({"name": rel_path, "size": item.stat().st_size, "type": "file"})
-                else:
-                    dirs.append({"name": rel_path, "type": "directory"})
-            
-            return {"success": True, "directories": dirs, "files": files}
-        
-        elif name == "execute_python":
-            filepath = get_safe_path(arguments["filepath"])
-            args = arguments.get("args", [])
-            
-            if not filepath.exists():
-                return {"success": False, "error": f"Script not found: {arguments['filepath']}"}
-            if filepath.suffix != ".py":
-                return {"success": False, "error": "File must be a Python script (.py)"}
-            
-            try:
-                result = subprocess.run(
-                    [sys.executable, str(filepath)] + args,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    cwd=str(WORKSPACE_DIR),
-                )
-                return {
-                    "success": True,
-                    "exit_code": result.returncode,
-                    "stdout": result.stdout,
-                    "stderr": result.stderr
-                }
-            except subprocess.TimeoutExpired:
-                return {"success": False, "error": "Script execution timed out after 30 seconds"}
-            except Exception as e:
-                return {"success": False, "error": f"Error executing script: {str(e)}"}
-        
-        elif name == "create_directory":
-            dirpath = get_safe_path(arguments["dirpath"])
-            dirpath.mkdir(parents=True, exist_ok=True)
-            return {"success": True, "message": f"Created directory: {arguments['dirpath']}"}
-        
+        size = os.fstat(fd).st_size
+        if size > _MMAP_READ_THRESHOLD:
+            # Map the file and slice it out: the kernel demand-pages the
+            # content straight into the result, skipping the read() copy
+            # through an intermediate buffer.
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:]
+        data = os.read(fd, size)
+        # Regular files normally come back in one read; loop just in case.
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return data
+
+
+def _write_bytes(filepath: Path, data: bytes) -> None:
+    """Write a whole file through a raw fd, skipping the buffered io layer"""
+    fd = os.open(str(filepath), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # os.write may write fewer bytes than asked; loop like _read_bytes
+        # does so a short write cannot silently truncate the file.
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Decoded read_file results keyed by (path, mtime_ns, size). The key changes
+# whenever the file does, so a hit is always current; explicit eviction on
+# writes/deletes just keeps dead entries from occupying LRU slots.
+_READ_CACHE: OrderedDict = OrderedDict()
+_READ_CACHE_LOCK = threading.Lock()
+_READ_CACHE_MAX = 64
+_READ_CACHE_MAX_FILE_SIZE = 1 << 20
+
+
+def _read_cache_evict(path: str) -> None:
+    """Drop any cached content for the given resolved path"""
+    with _READ_CACHE_LOCK:
+        for key in [k for k in _READ_CACHE if k[0] == path]:
+            del _READ_CACHE[key]
+
+
+# The tool list never changes after import, so serialize it once instead of
+# rebuilding and re-encoding it on every tools/list request.
+_TOOLS = get_tools()
+_TOOLS_RESULT_JSON = _J({"tools": _TOOLS})
+
+# Partial evaluation of the tools/list frame: everything except the message
+# id is static, so bake the surrounding bytes once and splice the id in at
+# request time.
+_TOOLS_FRAME_PREFIX = b'event: message\ndata: {"jsonrpc":"2.0","id":'
+_TOOLS_FRAME_SUFFIX = (',"result":' + _TOOLS_RESULT_JSON + '}\n\n').encode('utf-8')
+
+# The initialize result is immutable; the GET variant (always id 1) is
+# pre-encoded down to the final SSE bytes.
+_INIT_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {"name": "ai-workspace", "version": "1.0.0"},
+}
+_INIT_SSE_BYTES = b"event: message\ndata: " + _dumps(
+    {"jsonrpc": "2.0", "id": 1, "result": _INIT_RESULT}
+) + b"\n\n"
+
+
+def _tool_create_file(arguments: dict, progress=None) -> dict:
+    filepath = get_safe_path(arguments["filepath"])
+    content = arguments["content"]
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    data = content.encode("utf-8")
+    _write_bytes(filepath, data)
+    _read_cache_evict(str(filepath))
+    return {"success": True, "message": f"Created file: {arguments['filepath']} ({len(data)} bytes)"}
+
+
+def _tool_read_file(arguments: dict, progress=None) -> dict:
+    filepath = get_safe_path(arguments["filepath"])
+    try:
+        st = filepath.stat()
+    except FileNotFoundError:
+        return {"success": False, "error": f"File not found: {arguments['filepath']}"}
+
+    key = (str(filepath), st.st_mtime_ns, st.st_size)
+    with _READ_CACHE_LOCK:
+        content = _READ_CACHE.get(key)
+        if content is not None:
+            _READ_CACHE.move_to_end(key)
+    if content is None:
+        content = _read_bytes(filepath).decode("utf-8")
+        if st.st_size <= _READ_CACHE_MAX_FILE_SIZE:
+            with _READ_CACHE_LOCK:
+                _READ_CACHE[key] = content
+                if len(_READ_CACHE) > _READ_CACHE_MAX:
+                    _READ_CACHE.popitem(last=False)
+    return {"success": True, "content": content, "filepath": arguments['filepath']}
+
+
+def _tool_update_file(arguments: dict, progress=None) -> dict:
+    filepath = get_safe_path(arguments["filepath"])
+    content = arguments["content"]
+    if not filepath.exists():
+        return {"success": False, "error": f"File not found: {arguments['filepath']}"}
+    data = content.encode("utf-8")
+    _write_bytes(filepath, data)
+    _read_cache_evict(str(filepath))
+    return {"success": True, "message": f"Updated file: {arguments['filepath']} ({len(data)} bytes)"}
+
+
+def _tool_delete_file(arguments: dict, progress=None) -> dict:
+    filepath = get_safe_path(arguments["filepath"])
+    if not filepath.exists():
+        return {"success": False, "error": f"File not found: {arguments['filepath']}"}
+    filepath.unlink()
+    _read_cache_evict(str(filepath))
+    # A deleted entry may have been a symlink, so cached resolutions
+    # can no longer be trusted.
+    get_safe_path.cache_clear()
+    return {"success": True, "message": f"Deleted file: {arguments['filepath']}"}
+
+
+def _tool_list_files(arguments: dict, progress=None) -> dict:
+    directory = arguments.get("directory", "")
+    dirpath = get_safe_path(directory) if directory else WORKSPACE_DIR
+    if not dirpath.exists():
+        return {"success": False, "error": f"Directory not found: {directory}"}
+
+    # scandir reads the directory in bulk via getdents64 and carries
+    # cached stat results on each entry, instead of one stat syscall
+    # per file on top of the listing.
+    with os.scandir(dirpath) as it:
+        entries = list(it)
+
+    # Collect parallel name/size/kind arrays in one pass, slicing the
+    # workspace-relative name off entry.path instead of re-parsing it with
+    # relpath, then sort a single index array by name.
+    prefix_len = len(str(dirpath)) + 1
+    names = []
+    sizes = []
+    kinds = []
+    for entry in entries:
+        rel = entry.path[prefix_len:]
+        names.append(os.path.join(directory, rel) if directory else rel)
+        if entry.is_file():
+            sizes.append(entry.stat().st_size)
+            kinds.append("file")
         else:
-            return {"success": False, "error": f"Unknown tool: {name}"}
-    
+            sizes.append(-1)
+            kinds.append("directory")
+
+    files = []
+    dirs = []
+    for i in sorted(range(len(names)), key=names.__getitem__):
+        if kinds[i] == "file":
+            files.append({"name": names[i], "size": sizes[i], "type": "file"})
+        else:
+            dirs.append({"name": names[i], "type": "directory"})
+
+    return {"success": True, "directories": dirs, "files": files}
+
+
+def _tool_execute_python(arguments: dict, progress=None) -> dict:
+    filepath = get_safe_path(arguments["filepath"])
+    args = arguments.get("args", [])
+
+    if not filepath.exists():
+        return {"success": False, "error": f"Script not found: {arguments['filepath']}"}
+    if filepath.suffix != ".py":
+        return {"success": False, "error": "File must be a Python script (.py)"}
+
+    worker = _get_worker()
+    if worker is not None:
+        try:
+            stdout, stderr, exit_code = worker.run(str(filepath), args, 30, on_line=progress)
+        except TimeoutError:
+            return {"success": False, "error": "Script execution timed out after 30 seconds"}
+        except Exception as e:
+            return {"success": False, "error": f"Error executing script: {str(e)}"}
+        finally:
+            # The script may have created symlinks, so cached resolutions
+            # are no longer proof of containment.
+            get_safe_path.cache_clear()
+        return {
+            "success": True,
+            "exit_code": exit_code,
+            "stdout": stdout,
+            "stderr": stderr
+        }
+
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            [sys.executable, str(filepath)] + args,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            cwd=str(WORKSPACE_DIR),
+        )
+        return {
+            "success": True,
+            "exit_code": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr
+        }
+    except subprocess.TimeoutExpired:
+        return {"success": False, "error": "Script execution timed out after 30 seconds"}
+    except Exception as e:
+        return {"success": False, "error": f"Error executing script: {str(e)}"}
+    finally:
+        # Same invalidation as the worker path: the script may have
+        # created symlinks.
+        get_safe_path.cache_clear()
+
+
+def _tool_create_directory(arguments: dict, progress=None) -> dict:
+    dirpath = get_safe_path(arguments["dirpath"])
+    dirpath.mkdir(parents=True, exist_ok=True)
+    return {"success": True, "message": f"Created directory: {arguments['dirpath']}"}
+
+
+# O(1) routing instead of a string compare per known tool.
+_TOOL_DISPATCH = {
+    "create_file": _tool_create_file,
+    "read_file": _tool_read_file,
+    "update_file": _tool_update_file,
+    "delete_file": _tool_delete_file,
+    "list_files": _tool_list_files,
+    "execute_python": _tool_execute_python,
+    "create_directory": _tool_create_directory,
+}
+
+
+def execute_tool(name: str, arguments: dict, progress=None) -> dict:
+    """Execute a tool and return the result.
+
+    When progress is given, execute_python invokes it with each stdout line
+    as the script runs (used to stream SSE progress frames).
+    """
+    fn = _TOOL_DISPATCH.get(name)
+    if fn is None:
+        return {"success": False, "error": f"Unknown tool: {name}"}
+    try:
+        return fn(arguments, progress)
     except ValueError as e:
         return {"success": False, "error": f"Security error: {str(e)}"}
     except Exception as e:
@@ -204,6 +570,32 @@ def execute_tool(name: str, arguments: dict) -> dict:
 
 from http.server import BaseHTTPRequestHandler
 
+# SSE keep-alive: proxies drop idle streams, so long-lived GET connections
+# need periodic comment frames. One shared ticker serves every connection
+# (O(1) timers instead of one per client). Only the local dev server holds
+# GET connections open; on Vercel each invocation returns immediately, so
+# the ticker never starts there.
+_SSE_HEARTBEAT_INTERVAL = 15.0
+_SSE_CONNECTIONS: set = set()
+_SSE_CONNECTIONS_LOCK = threading.Lock()
+_KEEP_SSE_OPEN = False
+
+
+def _heartbeat_loop():
+    """Tick every interval, writing one keepalive comment per connection"""
+    while True:
+        time.sleep(_SSE_HEARTBEAT_INTERVAL)
+        with _SSE_CONNECTIONS_LOCK:
+            connections = list(_SSE_CONNECTIONS)
+        for wfile, closed in connections:
+            try:
+                wfile.write(b":\n\n")
+                wfile.flush()
+            except (BrokenPipeError, OSError):
+                with _SSE_CONNECTIONS_LOCK:
+                    _SSE_CONNECTIONS.discard((wfile, closed))
+                closed.set()
+
 
 class handler(BaseHTTPRequestHandler):
     """Vercel handler for SSE endpoint"""
@@ -226,73 +618,61 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('X-Accel-Buffering', 'no')
         self.end_headers()
         
-        # MCP initialization message
-        init_message = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "ai-workspace",
-                    "version": "1.0.0"
-                }
-            }
-        }
-        
-        sse_data = f"event: message\ndata: {json.dumps(init_message)}\n\n"
-        self.wfile.write(sse_data.encode('utf-8'))
+        # MCP initialization message, encoded once at import
+        self.wfile.write(_INIT_SSE_BYTES)
+
+        if _KEEP_SSE_OPEN:
+            # Hold the stream open until the shared ticker notices the
+            # client has gone away (its keepalive write fails).
+            closed = threading.Event()
+            with _SSE_CONNECTIONS_LOCK:
+                _SSE_CONNECTIONS.add((self.wfile, closed))
+            closed.wait()
     
-    def do_POST(self):
-        """Handle POST - MCP messages"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode('utf-8') if content_length > 0 else '{}'
-        
-        self.send_response(200)
-        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
-        self.send_header('Cache-Control', 'no-cache, no-transform')
-        self.send_header('Connection', 'keep-alive')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('X-Accel-Buffering', 'no')
-        self.end_headers()
-        
+    def _handle_message(self, message) -> bytes:
+        """Route one MCP message and return its encoded SSE frame"""
         try:
-            message = json.loads(body) if body else {}
             method_name = message.get('method', '')
             msg_id = message.get('id', 1)
-            
+
             # Handle different MCP methods
             if method_name == 'initialize':
                 response = {
                     "jsonrpc": "2.0",
                     "id": msg_id,
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {"tools": {}},
-                        "serverInfo": {"name": "ai-workspace", "version": "1.0.0"}
-                    }
+                    "result": _INIT_RESULT
                 }
-            
+
             elif method_name == 'tools/list':
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": msg_id,
-                    "result": {"tools": get_tools()}
-                }
-            
+                # Only the message id varies; splice it between the baked
+                # frame halves.
+                return _TOOLS_FRAME_PREFIX + _J(msg_id).encode('utf-8') + _TOOLS_FRAME_SUFFIX
+
             elif method_name == 'tools/call':
                 params = message.get('params', {})
                 tool_name = params.get('name')
                 arguments = params.get('arguments', {})
-                
-                result = execute_tool(tool_name, arguments)
-                
+
+                def progress(line):
+                    # Stream script output as it is produced instead of
+                    # buffering everything until the script finishes.
+                    frame = b"event: progress\ndata: " + _dumps(
+                        {"type": "progress", "tool": tool_name, "line": line}
+                    ) + b"\n\n"
+                    try:
+                        self.wfile.write(frame)
+                        self.wfile.flush()
+                    except (BrokenPipeError, OSError):
+                        pass
+
+                result = execute_tool(tool_name, arguments, progress=progress)
+
                 # Format result for MCP
                 if result.get('success'):
-                    content_text = result.get('message') or result.get('content') or json.dumps(result)
+                    content_text = result.get('message') or result.get('content') or _J(result)
                 else:
                     content_text = f"Error: {result.get('error', 'Unknown error')}"
-                
+
                 response = {
                     "jsonrpc": "2.0",
                     "id": msg_id,
@@ -300,7 +680,7 @@ class handler(BaseHTTPRequestHandler):
                         "content": [{"type": "text", "text": content_text}]
                     }
                 }
-            
+
             else:
                 response = {
                     "jsonrpc": "2.0",
@@ -310,15 +690,67 @@ class handler(BaseHTTPRequestHandler):
                         "message": f"Method not found: {method_name}"
                     }
                 }
-            
-            sse_data = f"event: message\ndata: {json.dumps(response)}\n\n"
-            self.wfile.write(sse_data.encode('utf-8'))
-            
+
         except Exception as e:
-            error_response = {
+            response = {
                 "jsonrpc": "2.0",
                 "id": 1,
                 "error": {"code": -32603, "message": str(e)}
             }
-            sse_data = f"event: message\ndata: {json.dumps(error_response)}\n\n"
-            self.wfile.write(sse_data.encode('utf-8'))
+
+        return b"event: message\ndata: " + _dumps(response) + b"\n\n"
+
+    def do_POST(self):
+        """Handle POST - MCP messages"""
+        content_length = int(self.headers.get('Content-Length', 0))
+        # json.loads accepts bytes directly; decoding here would just add a
+        # second pass over the payload.
+        body = self.rfile.read(content_length) if content_length > 0 else b''
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache, no-transform')
+        self.send_header('Connection', 'keep-alive')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+
+        try:
+            message = json.loads(body) if body else {}
+        except Exception as e:
+            error_response = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "error": {"code": -32700, "message": f"Parse error: {str(e)}"}
+            }
+            self.wfile.write(b"event: message\ndata: " + _dumps(error_response) + b"\n\n")
+            return
+
+        if isinstance(message, list):
+            # JSON-RPC batch: route every request in order, one SSE frame
+            # each, accumulated and pushed to the socket in a single write
+            # (progress frames still stream as they happen).
+            frames = bytearray()
+            for item in message:
+                frames += self._handle_message(item)
+            self.wfile.write(frames)
+        else:
+            self.wfile.write(self._handle_message(message))
+
+
+if __name__ == "__main__":
+    # Local development server. On Vercel each invocation gets its own
+    # isolated instance, so concurrency is the platform's job; locally the
+    # single-threaded HTTPServer would let one long-lived SSE connection
+    # block every other client, hence the thread-per-connection server.
+    from http.server import ThreadingHTTPServer
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    _KEEP_SSE_OPEN = True
+    threading.Thread(target=_heartbeat_loop, daemon=True).start()
+    server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    print(f"Serving MCP SSE endpoint on http://localhost:{port}/api/sse")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
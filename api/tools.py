@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tool listing endpoint - This will be accessible at /api/tools
+Serves the static tool schema with a strong ETag so clients can revalidate
+with If-None-Match and skip the body transfer on a 304
+"""
+
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler
+
+try:
+    from api.sse import get_tools
+except ImportError:
+    # Local development runs with api/ itself on the path
+    from sse import get_tools
+
+# The schema never changes after import, so body and ETag are computed once
+_BODY = json.dumps({"tools": get_tools()}, separators=(",", ":")).encode('utf-8')
+_ETAG = '"%s"' % hashlib.sha256(_BODY).hexdigest()
+
+
+class handler(BaseHTTPRequestHandler):
+    """Vercel handler for the tool listing"""
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == _ETAG:
+            self.send_response(304)
+            self.send_header('ETag', _ETAG)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', _ETAG)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
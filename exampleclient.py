@@ -5,176 +5,408 @@ Demonstrates how to interact with the API
 """
 
 import requests
+import gc
+import gzip
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Fastest available JSON codec, picked once at import so the request/response
+# hot path never branches on availability: orjson, then ujson, then stdlib.
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+elif ujson is not None:
+    _loads = ujson.loads
+
+    def _dumps(obj) -> bytes:
+        return ujson.dumps(obj).encode('utf-8')
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
 
 # Update this with your Vercel deployment URL
 BASE_URL = "https://your-project.vercel.app"
 
+# Full endpoint URLs built once instead of an f-string per request
+_HEALTH_URL = f"{BASE_URL}/health"
+_TOOLS_URL = f"{BASE_URL}/tools"
+_EXECUTE_URL = f"{BASE_URL}/execute"
+_EXECUTE_BATCH_URL = f"{BASE_URL}/execute/batch"
+
+# Pretty-printing every response is ~3x the cost of compact dumps and only
+# helps a human watching; set MCP_VERBOSE=0 for scripted/batch runs.
+VERBOSE = os.getenv("MCP_VERBOSE", "1") == "1"
+
+_JSON_HEADERS = {
+    "Content-Type": "application/json",
+    # Let the edge compress JSON bodies (tool listings shrink ~10x). The
+    # client libraries decode gzip themselves but only handle brotli with a
+    # decoder package installed, so advertise br solely when one imports —
+    # otherwise the still-compressed bytes would reach the JSON parser.
+    "Accept-Encoding": "gzip, br" if brotli is not None else "gzip",
+}
+
+# Transport is chosen once at import. With httpx (and its h2 extra)
+# installed, concurrent requests multiplex as HTTP/2 streams over a single
+# TLS connection — effective pipelining that HTTP/1.1 can't do. Otherwise a
+# shared requests.Session still gives keep-alive and connection pooling, so
+# only the first request pays the TCP+TLS handshake.
+SESSION = None
+if httpx is not None:
+    try:
+        SESSION = httpx.Client(
+            http2=True,
+            headers=_JSON_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+        _REQUEST_ERRORS = (httpx.HTTPError,)
+    except ImportError:
+        # httpx present but the h2 extra is not
+        SESSION = None
+if SESSION is None:
+    SESSION = requests.Session()
+    SESSION.headers.update(_JSON_HEADERS)
+    SESSION.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        ),
+    )
+    _REQUEST_ERRORS = (requests.exceptions.RequestException,)
+
+
+def rjson(response):
+    """Parse a response body, letting the chosen codec work on the raw bytes"""
+    return _loads(response.content)
+
+
+def _stream_bytes(url: str, payload: bytes) -> bytes:
+    """POST and read a potentially large response in fixed-size chunks.
+
+    For big execute_python/read_file bodies this avoids the client library
+    materializing the payload as a cached str on top of the parsed result.
+    """
+    body, headers = _maybe_gzip(payload)
+    if httpx is not None and isinstance(SESSION, httpx.Client):
+        with SESSION.stream("POST", url, content=body, headers=headers) as response:
+            return b"".join(response.iter_bytes(65536))
+    response = SESSION.post(url, data=body, headers=headers, stream=True)
+    return b"".join(response.iter_content(65536))
+
+
+def pretty(obj) -> str:
+    """Format an object as indented JSON for display"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    if ujson is not None:
+        return ujson.dumps(obj, indent=2)
+    return json.dumps(obj, indent=2)
+
+
+# Below this size the gzip header and extra CPU outweigh the bytes saved
+_GZIP_MIN_BYTES = 1024
+
+
+def _maybe_gzip(payload: bytes):
+    """Compress a large request body, returning (body, extra headers).
+
+    Level 1 keeps the CPU cost negligible while still shrinking script and
+    dataset uploads severalfold; small bodies go out untouched.
+    """
+    if len(payload) > _GZIP_MIN_BYTES:
+        return gzip.compress(payload, compresslevel=1), {"Content-Encoding": "gzip"}
+    return payload, None
+
+
+def _post_bytes(url: str, payload: bytes):
+    """POST a pre-encoded body with whichever client is active"""
+    body, headers = _maybe_gzip(payload)
+    if httpx is not None and isinstance(SESSION, httpx.Client):
+        return SESSION.post(url, content=body, headers=headers)
+    return SESSION.post(url, data=body, headers=headers)
+
+
+# Execute results arrive as flat JSON objects; decoding them straight into a
+# slotted struct replaces three dict lookups per field access with slot loads
+# and validates field types as a side effect. With msgspec installed both the
+# parse and the slot assignment happen in C.
+if msgspec is not None:
+    class ExecResult(msgspec.Struct):
+        """Typed view of an /execute result"""
+        success: bool = False
+        message: str = ""
+        error: str = ""
+        content: str = ""
+        stdout: str = ""
+        stderr: str = ""
+        exit_code: int = 0
+        files: list = []
+        directories: list = []
+
+    _decode_result = msgspec.json.Decoder(ExecResult).decode
+else:
+    class ExecResult:
+        """Typed view of an /execute result (plain-dict fallback)"""
+
+        __slots__ = ("success", "message", "error", "content", "stdout",
+                     "stderr", "exit_code", "files", "directories")
+
+        def __init__(self, d: dict):
+            self.success = d.get("success", False)
+            self.message = d.get("message", "")
+            self.error = d.get("error", "")
+            self.content = d.get("content", "")
+            self.stdout = d.get("stdout", "")
+            self.stderr = d.get("stderr", "")
+            self.exit_code = d.get("exit_code", 0)
+            self.files = d.get("files", [])
+            self.directories = d.get("directories", [])
+
+    def _decode_result(data: bytes) -> "ExecResult":
+        return ExecResult(_loads(data))
+
+
+class Req:
+    """A tool invocation whose serialized body is cached after first use.
+
+    Slots keep per-instance overhead down and the cached bytes mean a Req
+    reused in a loop costs zero dict builds and zero encodes per call.
+    """
+
+    __slots__ = ("tool", "arguments", "_cached")
+
+    def __init__(self, tool: str, arguments: dict):
+        self.tool = tool
+        self.arguments = arguments
+        self._cached = None
+
+    def to_bytes(self) -> bytes:
+        if self._cached is None:
+            self._cached = _dumps({"tool": self.tool, "arguments": self.arguments})
+        return self._cached
+
+
+def execute(req: Req, stream: bool = False) -> ExecResult:
+    """Run one tool invocation against /execute and return the typed result"""
+    if stream:
+        return _decode_result(_stream_bytes(_EXECUTE_URL, req.to_bytes()))
+    return _decode_result(_post_bytes(_EXECUTE_URL, req.to_bytes()).content)
+
+
+# Processing script for the pipeline example
+_PROCESS_SCRIPT = """
+import json
+
+with open('data/input.json', 'r') as f:
+    data = json.load(f)
+
+result = sum(data)
+print(f"Sum of {data} = {result}")
+
+with open('data/output.json', 'w') as f:
+    json.dump({"sum": result}, f)
+"""
+
+# None of the example requests ever change, so each is a module-level Req
+# whose body is encoded exactly once across the whole run.
+_REQ_CREATE_HELLO = Req("create_file", {
+    "filepath": "hello.py",
+    "content": 'print("Hello from Vercel MCP!")\nprint("AI Workspace is operational")'
+})
+_REQ_EXECUTE_HELLO = Req("execute_python", {"filepath": "hello.py"})
+_REQ_LIST_FILES = Req("list_files", {})
+_PAYLOAD_PIPELINE_SETUP = _dumps({
+    "ops": [
+        {
+            "tool": "create_directory",
+            "arguments": {"dirpath": "data"}
+        },
+        {
+            "tool": "create_file",
+            "arguments": {
+                "filepath": "data/input.json",
+                "content": json.dumps([1, 2, 3, 4, 5])
+            }
+        },
+        {
+            "tool": "create_file",
+            "arguments": {
+                "filepath": "process.py",
+                "content": _PROCESS_SCRIPT
+            }
+        }
+    ]
+})
+_REQ_EXECUTE_PROCESS = Req("execute_python", {"filepath": "process.py"})
+_REQ_READ_OUTPUT = Req("read_file", {"filepath": "data/output.json"})
+
+# Everything built above lives for the whole run; moving it to the permanent
+# generation keeps the collector from re-scanning it on every gen-0 pass.
+gc.freeze()
+
 
 def test_health():
     """Test health endpoint"""
     print("Testing health endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(_HEALTH_URL)
     print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
+    if VERBOSE:
+        print(f"Response: {pretty(rjson(response))}\n")
+
+
+# Conditional-GET state for the (static) tool listing
+_tools_etag = None
+_tools_cache = None
 
 
 def list_tools():
     """List available tools"""
+    global _tools_etag, _tools_cache
     print("Listing available tools...")
-    response = requests.get(f"{BASE_URL}/tools")
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
+    headers = {"If-None-Match": _tools_etag} if _tools_etag else None
+    response = SESSION.get(_TOOLS_URL, headers=headers)
+    if response.status_code == 304 and _tools_cache is not None:
+        # Not modified: reuse the parsed listing, no body transferred
+        tools = _tools_cache
+    else:
+        tools = rjson(response)
+        _tools_cache = tools
+        _tools_etag = response.headers.get("ETag")
+    if VERBOSE:
+        print(f"Response: {pretty(tools)}\n")
 
 
 def create_file_example():
     """Create a file"""
     print("Creating a Python file...")
-    response = requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "create_file",
-            "arguments": {
-                "filepath": "hello.py",
-                "content": 'print("Hello from Vercel MCP!")\nprint("AI Workspace is operational")'
-            }
-        }
-    )
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
+    result = execute(_REQ_CREATE_HELLO)
+    if VERBOSE:
+        print(f"Response: {result.message or result.error}\n")
 
 
 def execute_python_example():
     """Execute a Python script"""
     print("Executing Python script...")
-    response = requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "execute_python",
-            "arguments": {
-                "filepath": "hello.py"
-            }
-        }
-    )
-    result = response.json()
-    print(f"Success: {result.get('success')}")
-    print(f"Exit Code: {result.get('exit_code')}")
-    print(f"Output:\n{result.get('stdout')}")
-    if result.get('stderr'):
-        print(f"Errors:\n{result.get('stderr')}")
+    result = execute(_REQ_EXECUTE_HELLO, stream=True)
+    print(f"Success: {result.success}")
+    print(f"Exit Code: {result.exit_code}")
+    print(f"Output:\n{result.stdout}")
+    if result.stderr:
+        print(f"Errors:\n{result.stderr}")
     print()
 
 
 def list_files_example():
     """List files in workspace"""
     print("Listing files...")
-    response = requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "list_files",
-            "arguments": {}
-        }
-    )
-    result = response.json()
-    if result.get('success'):
-        print(f"Files: {json.dumps(result.get('files'), indent=2)}")
-        print(f"Directories: {json.dumps(result.get('directories'), indent=2)}\n")
+    result = execute(_REQ_LIST_FILES)
+    if result.success and VERBOSE:
+        print(f"Files: {pretty(result.files)}")
+        print(f"Directories: {pretty(result.directories)}\n")
 
 
 def create_data_pipeline():
     """Create and run a data processing pipeline"""
     print("Creating data processing pipeline...")
-    
-    # Create directory
-    requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "create_directory",
-            "arguments": {"dirpath": "data"}
-        }
-    )
-    
-    # Create input data
-    requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "create_file",
-            "arguments": {
-                "filepath": "data/input.json",
-                "content": json.dumps([1, 2, 3, 4, 5])
-            }
-        }
-    )
-    
-    # Create processing script
-    script_content = """
-import json
 
-with open('data/input.json', 'r') as f:
-    data = json.load(f)
+    # The back-to-back requests below churn through short-lived dicts and
+    # buffers fast enough to trip gen-0 collections mid-request; defer that
+    # work until the pipeline is done.
+    gc.disable()
+    try:
+        # The directory and both files are independent of each other: create
+        # them all in one batched request instead of three round trips.
+        _post_bytes(_EXECUTE_BATCH_URL, _PAYLOAD_PIPELINE_SETUP)
 
-result = sum(data)
-print(f"Sum of {data} = {result}")
+        # Execute script
+        result = execute(_REQ_EXECUTE_PROCESS, stream=True)
+        print(f"Processing output:\n{result.stdout}")
 
-with open('data/output.json', 'w') as f:
-    json.dump({"sum": result}, f)
-"""
-    
-    requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "create_file",
-            "arguments": {
-                "filepath": "process.py",
-                "content": script_content
-            }
-        }
-    )
-    
-    # Execute script
-    response = requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "execute_python",
-            "arguments": {"filepath": "process.py"}
-        }
-    )
-    
-    result = response.json()
-    print(f"Processing output:\n{result.get('stdout')}")
-    
-    # Read result
-    response = requests.post(
-        f"{BASE_URL}/execute",
-        json={
-            "tool": "read_file",
-            "arguments": {"filepath": "data/output.json"}
-        }
-    )
-    
-    result = response.json()
-    if result.get('success'):
-        print(f"Result file content: {result.get('content')}\n")
+        # Read result
+        result = execute(_REQ_READ_OUTPUT, stream=True)
+        if result.success:
+            print(f"Result file content: {result.content}\n")
+    finally:
+        gc.enable()
+        gc.collect(0)
+
+
+def _warm_connection():
+    """Open the TCP+TLS connection ahead of the first real request"""
+    try:
+        SESSION.get(_HEALTH_URL, timeout=5)
+    except Exception:
+        # Purely opportunistic; the first real request will report errors
+        pass
 
 
 def main():
     """Run all examples"""
+    # Kick off the handshake in the background so it overlaps the banner
+    # output; by the time the first example fires, the pool already holds a
+    # warm keep-alive connection.
+    warmer = ThreadPoolExecutor(1)
+    warmer.submit(_warm_connection)
+    warmer.shutdown(wait=False)
+
     print("=" * 60)
     print("Vercel MCP Server - Example Client")
     print("=" * 60)
     print()
     
     try:
-        test_health()
-        list_tools()
+        # Health, tool listing and the workspace listing are independent
+        # reads — overlapping them costs roughly one round trip instead of
+        # three stacked ones.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(fn) for fn in (test_health, list_tools, list_files_example)]
+            for future in futures:
+                future.result()
+
         create_file_example()
         execute_python_example()
-        list_files_example()
         create_data_pipeline()
-        
+
         print("=" * 60)
         print("All examples completed successfully!")
         print("=" * 60)
     
-    except requests.exceptions.RequestException as e:
+    except _REQUEST_ERRORS as e:
         print(f"Error: {e}")
         print("\nMake sure to update BASE_URL with your Vercel deployment URL")
 